@@ -1,16 +1,61 @@
 import csv
 import os
+import sys
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Edge weights for matching-based pairing (used when networkx is available)
+PAIRING_BASE_WEIGHT = 10**9
+REPEAT_PENALTY = 10**8
+MATCH_POINTS_WEIGHT = 10**4
+GAME_POINTS_WEIGHT = 100
+COLOR_CONFLICT_WEIGHT = 10
+
+# Sort standings with NumPy from this many teams up (when available)
+NUMPY_STANDINGS_MIN_TEAMS = 1000
+
+# From this many teams up, skip the O(V^3) matching (about 1s at 160
+# teams mid-tournament) and pair greedily
+GREEDY_PAIRING_MIN_TEAMS = 160
+
+# Wide MAIN files easily exceed the default 8 KiB buffer per row
+CSV_BUFFER_SIZE = 1 << 20
 
 class Player:
+    __slots__ = ('name', 'rating', 'team_id', 'board', 'color_played', 'white_count',
+                 'opponents')
+    
     def __init__(self, name, rating, team_id, board):
         self.name = name
         self.rating = rating
         self.team_id = team_id
         self.board = board
-        self.colors = []  # 'W' or 'B'
+        self.color_played = 0  # number of rounds with a color recorded
+        self.white_count = 0
         self.opponents = []  # opponent player names
+    
+    def add_color(self, color):
+        if color == 'W':
+            self.white_count += 1
+        self.color_played += 1
+    
+    @property
+    def balance(self):
+        """Whites minus blacks"""
+        return 2 * self.white_count - self.color_played
 
 class Team:
+    __slots__ = ('id', 'name', 'players', 'match_points', 'game_points', 'opponents',
+                 'opponents_set', 'buchholz', '_rating_sum')
+    
     def __init__(self, team_id, name):
         self.id = team_id
         self.name = name
@@ -18,18 +63,29 @@ class Team:
         self.match_points = 0.0
         self.game_points = 0.0
         self.opponents = []  # opponent team IDs
+        self.opponents_set = set()  # same IDs, for fast membership tests
         self.buchholz = 0.0
+        self._rating_sum = 0
     
     def add_player(self, player):
         self.players.append(player)
+        self._rating_sum += player.rating
     
-    def sort_players(self):
-        self.players.sort(key=lambda p: p.board)
+    def add_opponent(self, team_id):
+        self.opponents.append(team_id)
+        self.opponents_set.add(team_id)
     
     def avg_rating(self):
         if not self.players:
             return 0
-        return sum(p.rating for p in self.players) / len(self.players)
+        return self._rating_sum / len(self.players)
+    
+    def rank_key(self):
+        """Single int sort key: match points, game points, Buchholz, avg rating (best first)"""
+        return -(round(self.match_points * 10) << 72
+                 | round(self.game_points * 10) << 48
+                 | round(self.buchholz * 10) << 24
+                 | round(self.avg_rating() * 100))
 
 class TeamSwissTournament:
     def __init__(self, csv_file):
@@ -37,8 +93,24 @@ class TeamSwissTournament:
         self.main_file = csv_file.replace('.csv', '_MAIN.csv')
         self.teams = {}
         self.players = {}
+        self.player_by_slot = {}  # (team_id, board) -> Player
+        self._teams_by_id_sorted = []
+        self._color_row_cache = {}  # team_id -> per-round lists of board color cells
         self.current_round = 0
         self.team_size = 0
+        self._standings_cache = None
+        
+        # Column names, built once the team size is known
+        self._board_name_keys = []
+        self._board_rating_keys = []
+        self._board_white_keys = []
+        self._board_black_keys = []
+        self._board_result_keys = []
+        self._round_opponent_keys = []
+        self._round_color_keys = []  # one list of board keys per round
+        self._results_headers = None
+        self._main_headers = None
+        self._main_headers_rounds = 0
     
     def load_teams_from_csv(self):
         """Load teams from initial CSV file"""
@@ -47,12 +119,29 @@ class TeamSwissTournament:
         print("="*80)
         
         try:
-            with open(self.csv_file, 'r') as f:
-                reader = csv.DictReader(f)
+            with open(self.csv_file, 'r', buffering=CSV_BUFFER_SIZE, newline='') as f:
+                reader = csv.reader(f, skipinitialspace=True)
+                headers = next(reader, [])
+                idx = {h: i for i, h in enumerate(headers)}
+                
+                team_id_col = idx['Team_ID']
+                team_name_col = idx['Team_Name']
+                
+                # Column indices for each board's player
+                board_cols = []
+                board = 1
+                while f'Board_{board}_Name' in idx:
+                    board_cols.append((idx[f'Board_{board}_Name'], idx[f'Board_{board}_Rating']))
+                    board += 1
                 
                 for row in reader:
-                    team_id = int(row['Team_ID'].strip())
-                    team_name = row['Team_Name'].strip()
+                    if not row:
+                        continue
+                    if len(row) < len(headers):
+                        row.extend([''] * (len(headers) - len(row)))
+                    
+                    team_id = int(row[team_id_col])
+                    team_name = row[team_name_col].strip()
                     
                     if team_id not in self.teams:
                         self.teams[team_id] = Team(team_id, team_name)
@@ -60,27 +149,23 @@ class TeamSwissTournament:
                     team = self.teams[team_id]
                     
                     # Load players for this team
-                    board = 1
-                    while True:
-                        name_key = f'Board_{board}_Name'
-                        rating_key = f'Board_{board}_Rating'
-                        
-                        if name_key not in row or not row[name_key].strip():
+                    for board, (name_col, rating_col) in enumerate(board_cols, 1):
+                        player_name = row[name_col].strip()
+                        if not player_name:
                             break
                         
-                        player_name = row[name_key].strip()
-                        player_rating = int(row[rating_key].strip())
+                        player_rating = int(row[rating_col])
                         
                         player = Player(player_name, player_rating, team_id, board)
                         self.players[player_name] = player
                         team.add_player(player)
-                        
-                        board += 1
-                    
-                    team.sort_players()
             
             if self.teams:
                 self.team_size = len(next(iter(self.teams.values())).players)
+            self._build_board_keys()
+            
+            self.player_by_slot = {(t.id, p.board): p for t in self.teams.values() for p in t.players}
+            self._teams_by_id_sorted = [self.teams[i] for i in sorted(self.teams)]
             
             print(f"✓ Loaded {len(self.teams)} teams")
             print(f"✓ Team size: {self.team_size} boards")
@@ -101,138 +186,290 @@ class TeamSwissTournament:
         print("="*80)
         
         try:
-            with open(self.main_file, 'r') as f:
-                reader = csv.DictReader(f)
+            with open(self.main_file, 'r', buffering=CSV_BUFFER_SIZE, newline='') as f:
+                reader = csv.reader(f, skipinitialspace=True)
+                headers = next(reader, [])
+                idx = {h: i for i, h in enumerate(headers)}
+                
+                team_id_col = idx['Team_ID']
+                match_points_col = idx['Match_Points']
+                game_points_col = idx['Game_Points']
+                buchholz_col = idx['Buchholz']
+                
+                # Column indices for each round's opponent and board colors
+                max_rounds = sum(1 for h in headers if h.startswith('Round_') and h.endswith('_Opponent'))
+                self._extend_round_keys(max_rounds)
+                opp_cols = [idx.get(key) for key in self._round_opponent_keys[:max_rounds]]
+                color_cols = [[idx.get(key) for key in round_keys]
+                              for round_keys in self._round_color_keys[:max_rounds]]
                 
                 for row in reader:
-                    team_id = int(row['Team_ID'])
+                    if not row:
+                        continue
+                    if len(row) < len(headers):
+                        row.extend([''] * (len(headers) - len(row)))
+                    
+                    team_id = int(row[team_id_col])
                     
                     if team_id not in self.teams:
                         continue
                     
                     team = self.teams[team_id]
-                    team.match_points = float(row['Match_Points'])
-                    team.game_points = float(row['Game_Points'])
-                    team.buchholz = float(row['Buchholz'])
+                    team.match_points = float(row[match_points_col])
+                    team.game_points = float(row[game_points_col])
+                    team.buchholz = float(row[buchholz_col])
                     
                     # Load opponent history
-                    round_num = 1
-                    while f'Round_{round_num}_Opponent' in row:
-                        opp_str = row[f'Round_{round_num}_Opponent'].strip()
+                    for opp_col, round_color_cols in zip(opp_cols, color_cols):
+                        if opp_col is None:
+                            continue
+                        
+                        opp_str = row[opp_col].strip()
                         if opp_str:
-                            team.opponents.append(int(opp_str))
+                            team.add_opponent(int(opp_str))
+                            
+                            color_cells = [row[col].strip() if col is not None else ''
+                                           for col in round_color_cols]
+                            self._color_row_cache.setdefault(team_id, []).append(color_cells)
                             
                             # Load color data for each player
                             for player in team.players:
-                                board = player.board
-                                color_key = f'Round_{round_num}_Board_{board}_Color'
-                                if color_key in row and row[color_key].strip():
-                                    player.colors.append(row[color_key].strip())
-                        
-                        round_num += 1
+                                color = color_cells[player.board - 1]
+                                if color:
+                                    player.add_color(color)
                     
                     self.current_round = max(self.current_round, len(team.opponents))
             
+            # Rebuild from the loaded history so later updates can be incremental
+            self._calculate_buchholz()
+            
             print(f"✓ Loaded tournament state")
             print(f"✓ Rounds completed: {self.current_round}")
             
         except Exception as e:
             print(f"Error loading MAIN file: {e}")
+        
+        self._standings_cache = None
     
     def load_round_results(self, round_num):
-        """Load results from round results file"""
+        """Load results from round results file, returning False if it is incomplete or invalid"""
         results_file = self.csv_file.replace('.csv', f'_ROUND_{round_num}_RESULTS.csv')
         
         if not os.path.exists(results_file):
-            return
+            return True
         
         print(f"\n✓ Loading Round {round_num} results...")
         
         try:
-            with open(results_file, 'r') as f:
-                reader = csv.DictReader(f)
+            with open(results_file, 'r', buffering=CSV_BUFFER_SIZE, newline='') as f:
+                reader = csv.reader(f, skipinitialspace=True)
+                headers = next(reader, [])
+                idx = {h: i for i, h in enumerate(headers)}
+                
+                team1_id_col = idx['Team1_ID']
+                team2_id_col = idx['Team2_ID']
+                
+                # Column indices for each board's white player and result
+                board_cols = [(idx.get(white_key), idx.get(result_key))
+                              for white_key, result_key in zip(self._board_white_keys, self._board_result_keys)]
                 
+                match_col = idx.get('Match')
+                
+                # Parse and check every match before changing any state, so a
+                # bad sheet leaves the tournament as it was
+                matches = []
+                pending = []
+                problems = []
                 for row in reader:
-                    team1_id = int(row['Team1_ID'])
-                    team2_id = int(row['Team2_ID'])
+                    if not row:
+                        continue
+                    if len(row) < len(headers):
+                        row.extend([''] * (len(headers) - len(row)))
                     
+                    label = row[match_col] if match_col is not None else str(len(matches) + 1)
+                    try:
+                        team1_id = int(row[team1_id_col])
+                        team2_id = int(row[team2_id_col])
+                    except ValueError:
+                        problems.append(f"match {label}: invalid team ID")
+                        continue
                     if team1_id not in self.teams or team2_id not in self.teams:
+                        problems.append(f"match {label}: unknown team ID")
                         continue
                     
-                    team1 = self.teams[team1_id]
-                    team2 = self.teams[team2_id]
-                    
-                    # Make sure teams are in each other's opponent lists
-                    if team2_id not in team1.opponents:
-                        team1.opponents.append(team2_id)
-                    if team1_id not in team2.opponents:
-                        team2.opponents.append(team1_id)
-                    
-                    team1_score = 0.0
-                    team2_score = 0.0
-                    
-                    # Process each board result
-                    for board in range(1, self.team_size + 1):
-                        result_key = f'Board_{board}_Result'
-                        white_key = f'Board_{board}_White'
-                        
-                        if result_key not in row or not row[result_key].strip():
+                    boards = []
+                    blank = False
+                    for board, (white_col, result_col) in enumerate(board_cols, 1):
+                        if result_col is None:
                             continue
-                        
-                        result = float(row[result_key].strip())
-                        white_name = row[white_key].strip()
-                        
-                        # Find which player was white
-                        team1_player = team1.players[board - 1]
-                        team2_player = team2.players[board - 1]
-                        
-                        if team1_player.name == white_name:
-                            # Team1 player was white
-                            team1_score += result
-                            team2_score += (1.0 - result)
-                            
-                            if 'W' not in team1_player.colors or len(team1_player.colors) < round_num:
-                                if len(team1_player.colors) < round_num:
-                                    team1_player.colors.append('W')
-                                if len(team2_player.colors) < round_num:
-                                    team2_player.colors.append('B')
-                        else:
-                            # Team2 player was white
-                            team2_score += result
-                            team1_score += (1.0 - result)
-                            
-                            if len(team2_player.colors) < round_num:
-                                team2_player.colors.append('W')
-                            if len(team1_player.colors) < round_num:
-                                team1_player.colors.append('B')
+                        result_str = row[result_col].strip()
+                        if not result_str:
+                            blank = True
+                            continue
+                        try:
+                            result = float(result_str)
+                        except ValueError:
+                            result = None
+                        if result not in (0.0, 0.5, 1.0):
+                            problems.append(f"match {label}, board {board}: result '{result_str}' is not 1, 0.5 or 0")
+                            continue
+                        team1_player = self.player_by_slot.get((team1_id, board))
+                        team2_player = self.player_by_slot.get((team2_id, board))
+                        if team1_player is None or team2_player is None:
+                            problems.append(f"match {label}, board {board}: no player on this board")
+                            continue
+                        white_name = row[white_col].strip() if white_col is not None else ''
+                        boards.append((board, result, team1_player, team2_player, team1_player.name == white_name))
                     
-                    # Calculate match points
-                    if team1_score > team2_score:
-                        team1.match_points = len(team1.opponents) * 2 - 2 + 2  # Previous + current
-                        team2.match_points = len(team2.opponents) * 2 - 2 + 0
-                    elif team2_score > team1_score:
-                        team1.match_points = len(team1.opponents) * 2 - 2 + 0
-                        team2.match_points = len(team2.opponents) * 2 - 2 + 2
+                    if blank:
+                        pending.append(label)
+                    matches.append((team1_id, team2_id, boards))
+            
+            if problems:
+                print(f"⚠ Round {round_num} not loaded, fix these entries in {results_file} and run again:")
+                for problem in problems:
+                    print(f"  {problem}")
+                return False
+            
+            # Only record the round once every match has its results, so an
+            # unfinished sheet can be completed and loaded on the next run
+            if len(pending) == len(matches):
+                print(f"⚠ No results entered for Round {round_num} yet")
+                return True
+            if pending:
+                print(f"⚠ Round {round_num} not loaded, results missing for match(es): {', '.join(pending)}")
+                print(f"  Fill them in {results_file} and run again")
+                return False
+            
+            for team1_id, team2_id, boards in matches:
+                team1 = self.teams[team1_id]
+                team2 = self.teams[team2_id]
+                
+                # Record the pairing for this round (repeats included, so
+                # opponent lists stay one entry per round), counting each
+                # new opponent's points towards Buchholz
+                if team2_id not in team1.opponents_set:
+                    team1.buchholz += team2.match_points
+                if team1_id not in team2.opponents_set:
+                    team2.buchholz += team1.match_points
+                team1.add_opponent(team2_id)
+                team2.add_opponent(team1_id)
+                
+                team1_score = 0.0
+                team2_score = 0.0
+                team1_cells = [''] * self.team_size
+                team2_cells = [''] * self.team_size
+                
+                # Process each board result
+                for board, result, team1_player, team2_player, team1_white in boards:
+                    if team1_white:
+                        # Team1 player was white
+                        team1_score += result
+                        team2_score += (1.0 - result)
+                        team1_cells[board - 1] = 'W'
+                        team2_cells[board - 1] = 'B'
+                        
+                        if team1_player.color_played < round_num:
+                            team1_player.add_color('W')
+                        if team2_player.color_played < round_num:
+                            team2_player.add_color('B')
                     else:
-                        team1.match_points = len(team1.opponents) * 2 - 2 + 1
-                        team2.match_points = len(team2.opponents) * 2 - 2 + 1
-                    
-                    team1.game_points += team1_score
-                    team2.game_points += team2_score
+                        # Team2 player was white
+                        team2_score += result
+                        team1_score += (1.0 - result)
+                        team2_cells[board - 1] = 'W'
+                        team1_cells[board - 1] = 'B'
+                        
+                        if team2_player.color_played < round_num:
+                            team2_player.add_color('W')
+                        if team1_player.color_played < round_num:
+                            team1_player.add_color('B')
+                
+                # Award match points: 2 for a win, 1 each for a draw
+                if team1_score > team2_score:
+                    d1, d2 = 2, 0
+                elif team2_score > team1_score:
+                    d1, d2 = 0, 2
+                else:
+                    d1, d2 = 1, 1
+                
+                team1.match_points += d1
+                team2.match_points += d2
+                
+                # Pass the new points on to every opponent's Buchholz
+                for team, delta in ((team1, d1), (team2, d2)):
+                    for opp_id in team.opponents_set:
+                        if opp_id in self.teams:
+                            self.teams[opp_id].buchholz += delta
+                
+                team1.game_points += team1_score
+                team2.game_points += team2_score
+                
+                # Remember this round's color cells for save_main
+                self._color_row_cache.setdefault(team1_id, []).append(team1_cells)
+                self._color_row_cache.setdefault(team2_id, []).append(team2_cells)
             
             self.current_round = round_num
-            self._calculate_buchholz()
             
         except Exception as e:
             print(f"Error loading results: {e}")
+            return False
+        
+        self._standings_cache = None
+        return True
+    
+    def _build_board_keys(self):
+        """Precompute per-board column names for the current team size"""
+        boards = range(1, self.team_size + 1)
+        self._board_name_keys = [f'Board_{board}_Name' for board in boards]
+        self._board_rating_keys = [f'Board_{board}_Rating' for board in boards]
+        self._board_white_keys = [f'Board_{board}_White' for board in boards]
+        self._board_black_keys = [f'Board_{board}_Black' for board in boards]
+        self._board_result_keys = [f'Board_{board}_Result' for board in boards]
+        self._round_opponent_keys = []
+        self._round_color_keys = []
+        self._results_headers = None
+        self._main_headers = None
+        self._main_headers_rounds = 0
+    
+    def _extend_round_keys(self, rounds):
+        """Make sure per-round column names exist for the first `rounds` rounds"""
+        while len(self._round_opponent_keys) < rounds:
+            rnd = len(self._round_opponent_keys) + 1
+            self._round_opponent_keys.append(f'Round_{rnd}_Opponent')
+            self._round_color_keys.append([f'Round_{rnd}_Board_{board}_Color'
+                                           for board in range(1, self.team_size + 1)])
     
     def _calculate_buchholz(self):
         """Calculate Buchholz scores (sum of opponents' match points)"""
         for team in self.teams.values():
             team.buchholz = 0.0
-            for opp_id in team.opponents:
+            for opp_id in team.opponents_set:
                 if opp_id in self.teams:
                     team.buchholz += self.teams[opp_id].match_points
+        self._standings_cache = None
+    
+    def _sorted_teams(self):
+        """Teams in standings order, cached until scores change"""
+        if self._standings_cache is None:
+            if np is not None and len(self.teams) >= NUMPY_STANDINGS_MIN_TEAMS:
+                arr = self._standings_array()
+                order = np.lexsort((-arr['avg'], -arr['buch'], -arr['gp'], -arr['mp']))
+                self._standings_cache = [self.teams[team_id] for team_id in arr['id'][order].tolist()]
+            else:
+                self._standings_cache = sorted(
+                    self.teams.values(),
+                    key=Team.rank_key
+                )
+        return self._standings_cache
+    
+    def _standings_array(self):
+        """Standings fields of all teams as a NumPy structured array"""
+        dtype = [('id', 'i8'), ('mp', 'f8'), ('gp', 'f8'), ('buch', 'f8'), ('avg', 'f8')]
+        return np.array(
+            [(t.id, t.match_points, t.game_points, t.buchholz, t.avg_rating()) for t in self.teams.values()],
+            dtype=dtype
+        )
     
     def display_teams(self):
         """Display all teams and their rosters"""
@@ -240,8 +477,7 @@ class TeamSwissTournament:
         print("TEAM ROSTERS")
         print("="*80)
         
-        for team_id in sorted(self.teams.keys()):
-            team = self.teams[team_id]
+        for team in self._teams_by_id_sorted:
             print(f"\nTeam {team.id}: {team.name} (Avg Rating: {team.avg_rating():.0f})")
             print("-" * 80)
             for player in team.players:
@@ -249,42 +485,40 @@ class TeamSwissTournament:
     
     def display_standings(self):
         """Display current standings"""
-        print("\n" + "="*90)
-        print("STANDINGS")
-        print("="*90)
-        print(f"{'Rank':<6} {'Team':<25} {'MP':<8} {'GP':<8} {'Buch':<8} {'Avg Rtg':<10}")
-        print("-" * 90)
-        
-        sorted_teams = sorted(
-            self.teams.values(),
-            key=lambda t: (-t.match_points, -t.game_points, -t.buchholz, -t.avg_rating())
-        )
+        lines = [
+            "\n" + "="*90,
+            "STANDINGS",
+            "="*90,
+            f"{'Rank':<6} {'Team':<25} {'MP':<8} {'GP':<8} {'Buch':<8} {'Avg Rtg':<10}",
+            "-" * 90
+        ]
+        
+        sorted_teams = self._sorted_teams()
         
         for rank, team in enumerate(sorted_teams, 1):
-            print(f"{rank:<6} {team.name:<25} {team.match_points:<8.1f} {team.game_points:<8.1f} "
-                  f"{team.buchholz:<8.1f} {team.avg_rating():<10.1f}")
+            lines.append(f"{rank:<6} {team.name:<25} {team.match_points:<8.1f} {team.game_points:<8.1f} "
+                         f"{team.buchholz:<8.1f} {team.avg_rating():<10.1f}")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def determine_colors(self, player1, player2):
         """Determine who plays white based on color balance"""
-        p1_whites = player1.colors.count('W')
-        p1_blacks = player1.colors.count('B')
-        p2_whites = player2.colors.count('W')
-        p2_blacks = player2.colors.count('B')
-        
-        p1_balance = p1_whites - p1_blacks
-        p2_balance = p2_whites - p2_blacks
+        # With no color history yet (round 1) both balances are 0
+        if player1.color_played or player2.color_played:
+            p1_balance = player1.balance
+            p2_balance = player2.balance
+            
+            # Player with fewer whites gets white
+            if p1_balance < p2_balance:
+                return player1, player2
+            elif p2_balance < p1_balance:
+                return player2, player1
         
-        # Player with fewer whites gets white
-        if p1_balance < p2_balance:
+        # Equal balance - higher rated gets white
+        if player1.rating >= player2.rating:
             return player1, player2
-        elif p2_balance < p1_balance:
-            return player2, player1
         else:
-            # Equal balance - higher rated gets white
-            if player1.rating >= player2.rating:
-                return player1, player2
-            else:
-                return player2, player1
+            return player2, player1
     
     def generate_round(self):
         """Generate pairings for next round"""
@@ -295,15 +529,54 @@ class TeamSwissTournament:
         print("="*80)
         
         # Sort teams
-        sorted_teams = sorted(
-            self.teams.values(),
-            key=lambda t: (-t.match_points, -t.game_points, -t.buchholz, -t.avg_rating())
-        )
+        sorted_teams = self._sorted_teams()
         
         pairings = []
+        
+        # With an odd field, the lowest-ranked team without a bye sits out
+        if len(sorted_teams) % 2:
+            bye_team = next((team for team in reversed(sorted_teams)
+                             if len(team.opponents) >= self.current_round), sorted_teams[-1])
+            sorted_teams = [team for team in sorted_teams if team is not bye_team]
+            print(f"⚠ Bye: {bye_team.name}")
+        
+        if nx is not None and len(sorted_teams) < GREEDY_PAIRING_MIN_TEAMS:
+            team_pairs = self._pair_teams_matching(sorted_teams)
+        else:
+            team_pairs = self._pair_teams_greedy(sorted_teams)
+        
+        for team1, team2 in team_pairs:
+            if team2.id in team1.opponents_set:
+                print(f"⚠ Repeat pairing: {team1.name} vs {team2.name}")
+            
+            # Create match with board pairings
+            match = {
+                'team1': team1,
+                'team2': team2,
+                'boards': []
+            }
+            
+            for board_num in range(1, self.team_size + 1):
+                p1 = team1.players[board_num - 1]
+                p2 = team2.players[board_num - 1]
+                
+                white, black = self.determine_colors(p1, p2)
+                
+                match['boards'].append({
+                    'board': board_num,
+                    'white': white,
+                    'black': black
+                })
+            
+            pairings.append(match)
+        
+        return round_num, pairings
+    
+    def _pair_teams_greedy(self, sorted_teams):
+        """Pair teams top-down, each with the next team it has not played"""
+        team_pairs = []
         paired = set()
         
-        # Swiss pairing
         for i, team1 in enumerate(sorted_teams):
             if team1.id in paired:
                 continue
@@ -313,7 +586,7 @@ class TeamSwissTournament:
             # Find opponent not played before
             for j in range(i + 1, len(sorted_teams)):
                 candidate = sorted_teams[j]
-                if candidate.id not in paired and candidate.id not in team1.opponents:
+                if candidate.id not in paired and candidate.id not in team1.opponents_set:
                     team2 = candidate
                     break
             
@@ -323,90 +596,105 @@ class TeamSwissTournament:
                     candidate = sorted_teams[j]
                     if candidate.id not in paired:
                         team2 = candidate
-                        print(f"⚠ Repeat pairing: {team1.name} vs {team2.name}")
                         break
             
             if team2 is None:
                 continue
             
-            # Create match with board pairings
-            match = {
-                'team1': team1,
-                'team2': team2,
-                'boards': []
-            }
-            
-            for board_num in range(1, self.team_size + 1):
-                p1 = team1.players[board_num - 1]
-                p2 = team2.players[board_num - 1]
-                
-                white, black = self.determine_colors(p1, p2)
-                
-                match['boards'].append({
-                    'board': board_num,
-                    'white': white,
-                    'black': black
-                })
-            
-            pairings.append(match)
+            team_pairs.append((team1, team2))
             paired.add(team1.id)
             paired.add(team2.id)
         
-        return round_num, pairings
+        return team_pairs
+    
+    def _pair_teams_matching(self, sorted_teams):
+        """Pair teams with a maximum-weight matching over all possible pairs"""
+        # Per-team scores and color needs, looked up once instead of per pair
+        stats = []
+        for team in sorted_teams:
+            due_black = due_white = 0
+            for board, player in enumerate(team.players):
+                balance = player.balance
+                if balance > 0:
+                    due_black |= 1 << board
+                elif balance < 0:
+                    due_white |= 1 << board
+            stats.append((team.match_points * MATCH_POINTS_WEIGHT, team.game_points * GAME_POINTS_WEIGHT,
+                          due_black, due_white, team.opponents_set, team.id))
+        
+        edges = []
+        for i, (mp1, gp1, black1, white1, played1, _) in enumerate(stats):
+            for j in range(i + 1, len(stats)):
+                mp2, gp2, black2, white2, _, id2 = stats[j]
+                # Boards where both players are due the same color
+                conflicts = bin((black1 & black2) | (white1 & white2)).count('1')
+                weight = (PAIRING_BASE_WEIGHT - abs(mp1 - mp2) - abs(gp1 - gp2)
+                          - conflicts * COLOR_CONFLICT_WEIGHT - (j - i))
+                if id2 in played1:
+                    weight -= REPEAT_PENALTY
+                edges.append((i, j, weight))
+        
+        graph = nx.Graph()
+        graph.add_weighted_edges_from(edges)
+        matching = nx.max_weight_matching(graph, maxcardinality=True)
+        
+        # Keep matches in standings order, higher-ranked team first
+        team_pairs = sorted((min(i, j), max(i, j)) for i, j in matching)
+        return [(sorted_teams[i], sorted_teams[j]) for i, j in team_pairs]
     
     def display_pairings(self, round_num, pairings):
         """Display round pairings"""
-        print("\n" + "="*95)
-        print(f"ROUND {round_num} PAIRINGS")
-        print("="*95)
+        lines = [
+            "\n" + "="*95,
+            f"ROUND {round_num} PAIRINGS",
+            "="*95
+        ]
         
         for match_num, match in enumerate(pairings, 1):
-            print(f"\nMatch {match_num}: {match['team1'].name} vs {match['team2'].name}")
-            print("-" * 95)
-            print(f"{'Bd':<4} {'White':<30} {'Rtg':<6} {'Black':<30} {'Rtg':<6}")
-            print("-" * 95)
+            lines.append(f"\nMatch {match_num}: {match['team1'].name} vs {match['team2'].name}")
+            lines.append("-" * 95)
+            lines.append(f"{'Bd':<4} {'White':<30} {'Rtg':<6} {'Black':<30} {'Rtg':<6}")
+            lines.append("-" * 95)
             
             for board_data in match['boards']:
                 white_str = f"{board_data['white'].name}"
                 black_str = f"{board_data['black'].name}"
                 
-                print(f"{board_data['board']:<4} {white_str:<30} {board_data['white'].rating:<6} "
-                      f"{black_str:<30} {board_data['black'].rating:<6}")
+                lines.append(f"{board_data['board']:<4} {white_str:<30} {board_data['white'].rating:<6} "
+                             f"{black_str:<30} {board_data['black'].rating:<6}")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def create_results_file(self, round_num, pairings):
         """Create results template file"""
         results_file = self.csv_file.replace('.csv', f'_ROUND_{round_num}_RESULTS.csv')
         
-        headers = ['Match', 'Team1_ID', 'Team1_Name', 'Team2_ID', 'Team2_Name']
+        if self._results_headers is None:
+            self._results_headers = ['Match', 'Team1_ID', 'Team1_Name', 'Team2_ID', 'Team2_Name']
+            for board_keys in zip(self._board_white_keys, self._board_black_keys, self._board_result_keys):
+                self._results_headers.extend(board_keys)
+        headers = self._results_headers
         
-        for board in range(1, self.team_size + 1):
-            headers.extend([
-                f'Board_{board}_White',
-                f'Board_{board}_Black',
-                f'Board_{board}_Result'
-            ])
+        rows = []
+        for match_num, match in enumerate(pairings, 1):
+            row = [
+                match_num,
+                match['team1'].id,
+                match['team1'].name,
+                match['team2'].id,
+                match['team2'].name
+            ]
+            
+            for board_data in match['boards']:
+                row.extend((board_data['white'].name, board_data['black'].name, ''))
+            
+            rows.append(row)
         
         try:
-            with open(results_file, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                
-                for match_num, match in enumerate(pairings, 1):
-                    row = {
-                        'Match': match_num,
-                        'Team1_ID': match['team1'].id,
-                        'Team1_Name': match['team1'].name,
-                        'Team2_ID': match['team2'].id,
-                        'Team2_Name': match['team2'].name
-                    }
-                    
-                    for board_data in match['boards']:
-                        board = board_data['board']
-                        row[f'Board_{board}_White'] = board_data['white'].name
-                        row[f'Board_{board}_Black'] = board_data['black'].name
-                        row[f'Board_{board}_Result'] = ''
-                    
-                    writer.writerow(row)
+            with open(results_file, 'w', buffering=CSV_BUFFER_SIZE, newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                writer.writerows(rows)
             
             print(f"\n✓ Results file created: {results_file}")
             return results_file
@@ -418,59 +706,75 @@ class TeamSwissTournament:
     def save_main(self):
         """Save tournament state to MAIN file"""
         try:
-            headers = ['Rank', 'Team_ID', 'Team_Name', 'Match_Points', 'Game_Points', 'Buchholz', 'Avg_Rating']
-            
-            # Add player columns
-            for board in range(1, self.team_size + 1):
-                headers.extend([f'Board_{board}_Name', f'Board_{board}_Rating'])
-            
-            # Add round columns
-            for rnd in range(1, self.current_round + 1):
-                headers.append(f'Round_{rnd}_Opponent')
+            headers = self._main_header()
+            
+            sorted_teams = self._sorted_teams()
+            blank_colors = [''] * self.team_size
+            
+            rows = []
+            for rank, team in enumerate(sorted_teams, 1):
+                row = [
+                    rank,
+                    team.id,
+                    team.name,
+                    f"{team.match_points:.1f}",
+                    f"{team.game_points:.1f}",
+                    f"{team.buchholz:.1f}",
+                    f"{team.avg_rating():.1f}"
+                ]
+                
+                # Add player data, in the same board order as the headers
                 for board in range(1, self.team_size + 1):
-                    headers.append(f'Round_{rnd}_Board_{board}_Color')
-            
-            sorted_teams = sorted(
-                self.teams.values(),
-                key=lambda t: (-t.match_points, -t.game_points, -t.buchholz, -t.avg_rating())
-            )
-            
-            with open(self.main_file, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
+                    if board - 1 < len(team.players):
+                        player = team.players[board - 1]
+                        row.extend([player.name, player.rating])
+                    else:
+                        row.extend(['', ''])
                 
-                for rank, team in enumerate(sorted_teams, 1):
-                    row = {
-                        'Rank': rank,
-                        'Team_ID': team.id,
-                        'Team_Name': team.name,
-                        'Match_Points': f"{team.match_points:.1f}",
-                        'Game_Points': f"{team.game_points:.1f}",
-                        'Buchholz': f"{team.buchholz:.1f}",
-                        'Avg_Rating': f"{team.avg_rating():.1f}"
-                    }
-                    
-                    # Add player data
-                    for player in team.players:
-                        board = player.board
-                        row[f'Board_{board}_Name'] = player.name
-                        row[f'Board_{board}_Rating'] = player.rating
-                    
-                    # Add round data
-                    for rnd in range(1, self.current_round + 1):
-                        if rnd - 1 < len(team.opponents):
-                            row[f'Round_{rnd}_Opponent'] = team.opponents[rnd - 1]
-                            
-                            for player in team.players:
-                                if rnd - 1 < len(player.colors):
-                                    row[f'Round_{rnd}_Board_{player.board}_Color'] = player.colors[rnd - 1]
+                # Add round data
+                color_rows = self._color_row_cache.get(team.id, [])
+                for rnd in range(1, self.current_round + 1):
+                    if rnd - 1 < len(team.opponents):
+                        row.append(team.opponents[rnd - 1])
+                    else:
+                        row.append('')
                     
-                    writer.writerow(row)
+                    if rnd - 1 < len(team.opponents) and rnd - 1 < len(color_rows):
+                        row.extend(color_rows[rnd - 1])
+                    else:
+                        row.extend(blank_colors)
+                
+                rows.append(row)
+            
+            with open(self.main_file, 'w', buffering=CSV_BUFFER_SIZE, newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                writer.writerows(rows)
             
             print(f"✓ Tournament state saved: {self.main_file}")
             
         except Exception as e:
             print(f"Error saving MAIN file: {e}")
+    
+    def _main_header(self):
+        """MAIN file header, built once and extended as rounds are added"""
+        if self._main_headers is None:
+            self._main_headers = ['Rank', 'Team_ID', 'Team_Name', 'Match_Points', 'Game_Points', 'Buchholz', 'Avg_Rating']
+            
+            # Add player columns
+            for board_keys in zip(self._board_name_keys, self._board_rating_keys):
+                self._main_headers.extend(board_keys)
+            self._main_headers_rounds = 0
+        
+        # Add columns for rounds not yet in the header
+        if self.current_round > self._main_headers_rounds:
+            self._extend_round_keys(self.current_round)
+            for rnd in range(self._main_headers_rounds, self.current_round):
+                self._main_headers.append(self._round_opponent_keys[rnd])
+                self._main_headers.extend(self._round_color_keys[rnd])
+            self._main_headers_rounds = self.current_round
+        
+        return self._main_headers
 
 def create_template(filename, num_teams, team_size):
     """Create blank team CSV template"""
@@ -483,7 +787,7 @@ def create_template(filename, num_teams, team_size):
         ])
     
     try:
-        with open(filename, 'w', newline='') as f:
+        with open(filename, 'w', buffering=CSV_BUFFER_SIZE, newline='') as f:
             writer = csv.DictWriter(f, fieldnames=headers)
             writer.writeheader()
             
@@ -553,9 +857,9 @@ def main():
             tournament.load_teams_from_csv()
             tournament.load_from_main()
             
-            # Try to load latest round results
-            if tournament.current_round > 0:
-                tournament.load_round_results(tournament.current_round)
+            # Load the next round's results, stopping if they are incomplete
+            if not tournament.load_round_results(tournament.current_round + 1):
+                return
             
             tournament.display_teams()
             tournament.display_standings()